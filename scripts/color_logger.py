@@ -45,9 +45,12 @@ class ColorLogger:
         self.logger.setLevel(level)
         self.color_enabled = True
 
-        handler = logging.StreamHandler()
-        handler.setFormatter(logging.Formatter('%(message)s'))
-        self.logger.addHandler(handler)
+        # The module can be imported under more than one name (color_logger, scripts.color_logger),
+        # only attach the handler once so that messages are not printed twice
+        if not self.logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self.logger.addHandler(handler)
 
     def log(self, level, message):
         reset = "\033[0m"
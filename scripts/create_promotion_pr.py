@@ -114,10 +114,14 @@ def main():
     with open("promotion_pr_body.md", "w") as pr_body_file:
         pr_body_file.write(pr_body)
 
-    pr_creation_command = f"gh pr create --title '{pr_title}' --body-file promotion_pr_body.md --base {args.base_branch} --head debian/pr/{args.normalized_version}-1"
+    pr_creation_command = ["gh", "pr", "create",
+                           "--title", pr_title,
+                           "--body-file", "promotion_pr_body.md",
+                           "--base", args.base_branch,
+                           "--head", f"debian/pr/{args.normalized_version}-1"]
     
     # Executing the PR creation command using GitHub CLI 
-    subprocess.run(pr_creation_command, shell=True, check=True)
+    subprocess.run(pr_creation_command, check=True)
         
 
 if __name__ == "__main__":
@@ -37,6 +37,7 @@ import shutil
 import argparse
 import glob
 import re
+import textwrap
 import traceback
 from helpers import create_new_directory
 from color_logger import logger
@@ -96,10 +97,7 @@ def produce_report(log_file=None):
         log += f"  - Remark:       {result.abi_pkg_diff_remark}\n"
         log += f"  - Output:       {"" if result.abi_pkg_diff_output is not None else result.abi_pkg_diff_output}\n"
         if result.abi_pkg_diff_output is not None:
-            cmd = f"echo \"{result.abi_pkg_diff_output}\" | sed 's/^/       /'"
-            output = subprocess.run(cmd, capture_output=True, text=True, shell=True)
-
-            log += f"{output.stdout}\n"
+            log += textwrap.indent(result.abi_pkg_diff_output, "       ") + "\n"
 
         log += ("-" * 100 + "\n")
 
@@ -192,17 +190,17 @@ def multiple_repo_deb_abi_checker(package_dir, apt_server_config, keep_temp=True
 
     final_ret = 0
 
-    for folder in os.listdir(package_dir):
-        folder_path = os.path.join(package_dir, folder)
-        if os.path.isdir(folder_path):
+    with os.scandir(package_dir) as entries:
+        folder_paths = [entry.path for entry in entries if entry.is_dir()]
 
-            try:
-                final_ret |= single_repo_deb_abi_checker(folder_path, apt_server_config, keep_temp, specific_apt_version)
-            except Exception as e:
-                logger.critical(f"Function single_repo_deb_abi_checker threw an exception: {e}")
+    for folder_path in folder_paths:
+        try:
+            final_ret |= single_repo_deb_abi_checker(folder_path, apt_server_config, keep_temp, specific_apt_version)
+        except Exception as e:
+            logger.critical(f"Function single_repo_deb_abi_checker threw an exception: {e}")
 
-                traceback.print_exc()
-                sys.exit(-1)
+            traceback.print_exc()
+            sys.exit(-1)
 
     log_file = os.path.join(package_dir, "abi_checker.log")
 
@@ -262,11 +260,15 @@ def single_repo_deb_abi_checker(repo_package_dir, apt_server_config, keep_temp=T
 
     logger.debug(f"[ABI_CHECKER]/[SINGLE_REPO]: performing abi checking for repo '{basedir}'")
 
+    # 'tree' is only used for the debug listings, skip them if it is not installed
+    if print_debug_tree and shutil.which("tree") is None:
+        logger.debug(f"[ABI_CHECKER]/[SINGLE_REPO]: 'tree' is not installed, skipping the directory listings")
+        print_debug_tree = False
+
     if print_debug_tree:
-        tree_cmd = f"tree -a {repo_package_dir} | sed 's/^/       /'"
-        tree_output = subprocess.run(tree_cmd, capture_output=True, text=True, shell=True)
+        tree_output = subprocess.run(["tree", "-a", repo_package_dir], capture_output=True, text=True)
         if tree_output.returncode == 0:
-            logger.debug(f"[ABI_CHECKER]/[SINGLE_REPO]: Content :\n{tree_output.stdout}")
+            logger.debug(f"[ABI_CHECKER]/[SINGLE_REPO]: Content :\n{textwrap.indent(tree_output.stdout, '       ')}")
         else:
             logger.error(f"[ABI_CHECKER]/[SINGLE_REPO]: Failed to run 'tree' command: {tree_output.stderr}")
 
@@ -277,7 +279,7 @@ def single_repo_deb_abi_checker(repo_package_dir, apt_server_config, keep_temp=T
     # Find the .deb file(s) in the abi_check_temp_dir that represents the core packages
     # We filter out the -dev and -dbgsym packages as we are interested in building the list of core packages
     # that are built from the repo.
-    deb_files = [f for f in os.listdir(repo_package_dir) if f.endswith('.deb') and '-dev' not in f and '-dbgsym' not in f]
+    deb_files = [f for f in glob.glob("*.deb", root_dir=repo_package_dir) if '-dev' not in f and '-dbgsym' not in f]
 
     if not deb_files:
         logger.warning(f"[ABI_CHECKER]/[SINGLE_REPO]: No .deb file found, nothing to compare, returning success")
@@ -285,6 +287,10 @@ def single_repo_deb_abi_checker(repo_package_dir, apt_server_config, keep_temp=T
 
     logger.debug(f"[ABI_CHECKER]/[SINGLE_REPO]: Found {len(deb_files)} package{"s" if len(deb_files) > 1 else ""}")
 
+    # The APT package list is the same for every package of the repo, so update it once and share it.
+    # It lives next to the per-package folders, the underscore guarantees no package name can collide with it
+    apt_opt = prepare_apt_cache(os.path.join(abi_check_temp_dir, "apt_cache"), apt_server_config)
+
     final_ret = 0
 
     for deb_file in deb_files:
@@ -303,7 +309,7 @@ def single_repo_deb_abi_checker(repo_package_dir, apt_server_config, keep_temp=T
                                          package_abi_check_temp_dir=package_abi_check_temp_dir,
                                          package_name=package_name,
                                          package_file=deb_file,
-                                         apt_server_config=apt_server_config,
+                                         apt_opt=apt_opt,
                                          keep_temp=keep_temp,
                                          specific_apt_version=specific_apt_version,
                                          print_debug_tree=print_debug_tree)
@@ -312,16 +318,63 @@ def single_repo_deb_abi_checker(repo_package_dir, apt_server_config, keep_temp=T
 
     return final_ret
 
+def prepare_apt_cache(apt_dir, apt_server_config):
+    """
+    Creates a private APT cache for the given APT server and updates its package list.
+
+    Args:
+        apt_dir (str): Directory where the sources.list and the APT cache are created.
+
+        apt_server_config (str): APT server configuration to download the old package to compare against.
+            Must be in the format "deb [arch=arm64 trusted=yes] http://pkg.qualcomm.com noble/stable main".
+
+    Returns:
+    --------
+        - list: The apt-get options selecting this cache, or None if the package list update failed.
+    """
+
+    logger.debug(f"[ABI_CHECKER]/[APT]: APT Server Config: {apt_server_config}")
+
+    create_new_directory(apt_dir)
+
+    # Create a temporary sources.list file
+    temp_sources_list = os.path.join(apt_dir, "sources.list")
+    with open(temp_sources_list, "w") as f:
+        f.write(apt_server_config)
+
+    cache_dir = os.path.join(apt_dir, "cache")
+    create_new_directory(cache_dir)
+
+    opt  = ["-o", f"Dir::Etc::sourcelist={temp_sources_list}"]
+    opt += ["-o", "Dir::Etc::sourceparts=/dev/null"]
+    opt += ["-o", f"Dir::State={cache_dir}"]
+    opt += ["-o", f"Dir::Cache={cache_dir}"]
+
+    # Update the package list
+    cmd = ["apt-get", "update"] + opt
+
+    logger.debug(f"[ABI_CHECKER]/[APT]: Running: {' '.join(cmd)}")
+    # Only stderr is reported, discard the (verbose) stdout instead of piping it back
+    apt_ret = subprocess.run(cmd, cwd=apt_dir, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if apt_ret.returncode != 0:
+        logger.critical(f"[ABI_CHECKER]/[APT]: Failed to update package list: {apt_ret.stderr}")
+        return None
+
+    return opt
+
 def single_package_abi_checker(repo_package_dir,
                                package_abi_check_temp_dir,
                                package_name,
                                package_file,
-                               apt_server_config,
+                               apt_opt,
                                keep_temp=True,
                                specific_apt_version=None,
                                print_debug_tree=False) -> int:
     """
     Runs the ABI check in a folder containing a single package.
+
+    apt_opt is the list of apt-get options returned by prepare_apt_cache(), or None if the
+    package list could not be updated.
     """
 
     result = global_checker_results[package_name]
@@ -348,7 +401,7 @@ def single_package_abi_checker(repo_package_dir,
     package_name_without_major = (package_name[:-1] if package_name[-1].isdigit() else package_name)
 
 
-    deb_dev_files = [f for f in os.listdir(repo_package_dir) if f.endswith('.deb') and package_name_without_major in f and "-dev" in f]
+    deb_dev_files = [f for f in glob.glob(f"*{glob.escape(package_name_without_major)}*.deb", root_dir=repo_package_dir) if "-dev" in f]
 
     if not deb_dev_files:
         logger.warning(f"[ABI_CHECKER]/{package_name}: No -dev.deb package found")
@@ -368,7 +421,7 @@ def single_package_abi_checker(repo_package_dir,
 
     # -dbgsym.ddeb package is optional, but if it exists, we need to extract it too
 
-    deb_ddeb_files = [f for f in os.listdir(repo_package_dir) if f.endswith('.ddeb') and f"{package_name}-dbgsym" in f]
+    deb_ddeb_files = glob.glob(f"*{glob.escape(package_name)}-dbgsym*.ddeb", root_dir=repo_package_dir)
 
     if not deb_ddeb_files:
         logger.warning(f"[ABI_CHECKER]/{package_name}: No -dbgsym.ddeb package found")
@@ -387,84 +440,56 @@ def single_package_abi_checker(repo_package_dir,
 
     if print_debug_tree:
         # Run the 'tree' command to list files in a tree structure
-        tree_cmd = f"tree -a {new_extract_dir} | sed 's/^/       /'"
-        tree_output = subprocess.run(tree_cmd, capture_output=True, text=True, shell=True)
+        tree_output = subprocess.run(["tree", "-a", new_extract_dir], capture_output=True, text=True)
         if tree_output.returncode == 0:
-            logger.debug(f"[ABI_CHECKER]/{package_name}: Tree structure of new_extract_dir:\n{tree_output.stdout}")
+            logger.debug(f"[ABI_CHECKER]/{package_name}: Tree structure of new_extract_dir:\n{textwrap.indent(tree_output.stdout, '       ')}")
         else:
             logger.error(f"[ABI_CHECKER]/{package_name}: Failed to run 'tree' command: {tree_output.stderr}")
 
     # ******* OLD DEB PACKAGE fetching *********************************************************
 
     logger.debug(f"[ABI_CHECKER]/{package_name}: Fetching old deb package from APT server")
-    logger.debug(f"[ABI_CHECKER]/{package_name}: APT Server Config: {apt_server_config}")
+
+    if apt_opt is None:
+        logger.critical(f"[ABI_CHECKER]/{package_name}: The APT package list is not available")
+        return RETURN_PPA_ERROR
 
     old_download_dir = os.path.join(package_abi_check_temp_dir, "old_download")
 
     create_new_directory(old_download_dir)
 
-    apt_dir = os.path.join(old_download_dir, "apt")
-    create_new_directory(apt_dir)
-
     # Use apt-get to download the latest version of the package
     if specific_apt_version is None:
         logger.debug(f"[ABI_CHECKER]/{package_name}: Using apt-get to download the *latest* version of {package_name}")
     else:
         logger.warning(f"[ABI_CHECKER]/{package_name}: Using apt-get to download the *specific* version {specific_apt_version} of {package_name}")
 
-    # Create a temporary sources.list file
-    temp_sources_list = os.path.join(apt_dir, "sources.list")
-    with open(temp_sources_list, "w") as f:
-        f.write(apt_server_config)
-
-    cache_dir = os.path.join(apt_dir, "cache")
-    create_new_directory(cache_dir)
-
-    opt  = f" -o Dir::Etc::sourcelist={temp_sources_list}"
-    opt += f" -o Dir::Etc::sourceparts=/dev/null"
-    opt += f" -o Dir::State={cache_dir}"
-    opt += f" -o Dir::Cache={cache_dir}"
-
-    # Update the package list
-    cmd = "apt-get update" + opt
-
-    logger.debug(f"[ABI_CHECKER]/{package_name}: Running: {cmd}")
-    apt_ret = subprocess.run(cmd, cwd=old_download_dir, shell=True, capture_output=True)
-    if apt_ret.returncode != 0:
-        logger.critical(f"[ABI_CHECKER]/{package_name}: Failed to update package list: {apt_ret.stderr}")
-        return RETURN_PPA_ERROR
-
-    # download the .deb package
-    pkg = package_name + (("=" + specific_apt_version) if specific_apt_version else "")
-    cmd = f"apt-get download {pkg}" + opt
-    apt_ret = subprocess.run(cmd, cwd=old_download_dir, shell=True, capture_output=True)
-    if apt_ret.returncode != 0:
-        logger.error(f"[ABI_CHECKER]/{package_name}: Failed to download {pkg}: {apt_ret.stderr}")
-        return RETURN_PPA_PACKAGE_NOT_FOUND
-    else:
-        logger.info(f"[ABI_CHECKER]/{package_name}: Downloaded {pkg}")
-
-    # download the -dev.deb package
-    pkg = package_name_without_major + "-dev"  + (("=" + specific_apt_version) if specific_apt_version else "")
-    cmd = f"apt-get download {pkg}" + opt
-    apt_ret = subprocess.run(cmd, cwd=old_download_dir, shell=True, capture_output=True)
-    if apt_ret.returncode != 0:
-        logger.warning(f"[ABI_CHECKER]/{package_name}: Failed to download {pkg}: {apt_ret.stderr}")
-    else:
-        logger.info(f"[ABI_CHECKER]/{package_name}: Downloaded {pkg}")
-
-    # download the -dbgsym.deb package
-    pkg = package_name + "-dbgsym"  + (("=" + specific_apt_version) if specific_apt_version else "")
-    cmd = f"apt-get download {pkg}" + opt
-    apt_ret = subprocess.run(cmd, cwd=old_download_dir, shell=True, capture_output=True)
-    if apt_ret.returncode != 0:
-        logger.warning(f"[ABI_CHECKER]/{package_name}: Failed to download {pkg}: {apt_ret.stderr}")
-    else:
-        logger.info(f"[ABI_CHECKER]/{package_name}: Downloaded {pkg}")
+    version_suffix = ("=" + specific_apt_version) if specific_apt_version else ""
+
+    # The .deb package is mandatory, the -dev.deb and -dbgsym.ddeb packages are optional
+    downloads = [(package_name + version_suffix, True),
+                 (package_name_without_major + "-dev" + version_suffix, False),
+                 (package_name + "-dbgsym" + version_suffix, False)]
+
+    # Download each package on its own, apt-get refuses the whole request if any of the packages
+    # is unavailable. Only stderr is reported, stdout is discarded
+    for pkg, required in downloads:
+        cmd = ["apt-get", "download", pkg] + apt_opt
+        apt_ret = subprocess.run(cmd, cwd=old_download_dir, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if apt_ret.returncode != 0:
+            if required:
+                logger.error(f"[ABI_CHECKER]/{package_name}: Failed to download {pkg}: {apt_ret.stderr}")
+                return RETURN_PPA_PACKAGE_NOT_FOUND
+            logger.warning(f"[ABI_CHECKER]/{package_name}: Failed to download {pkg}: {apt_ret.stderr}")
+        else:
+            logger.info(f"[ABI_CHECKER]/{package_name}: Downloaded {pkg}")
 
 
     # Configure the old packages paths
-    old_deb_file = next((f for f in os.listdir(old_download_dir) if f.endswith('.deb') and '-dev' not in f), None)
+    # List the downloaded .deb packages once, the -dev.deb lookup below uses the same list
+    old_deb_files = glob.glob("*.deb", root_dir=old_download_dir)
+
+    old_deb_file = next((f for f in old_deb_files if '-dev' not in f), None)
     if old_deb_file is None:
         logger.critical(f"[ABI_CHECKER]/{package_name}: No .deb file found in '{old_download_dir}' that does not contain '-dev' in the name")
         result.old_deb_name = "ERROR : None found"
@@ -479,7 +504,7 @@ def single_package_abi_checker(repo_package_dir,
     logger.info(f"[ABI_CHECKER]/{package_name}: Old package version: {old_version}")
     result.old_version = old_version
 
-    old_dev_file = next((f for f in os.listdir(old_download_dir) if f.endswith('.deb') and '-dev' in f), None)
+    old_dev_file = next((f for f in old_deb_files if '-dev' in f), None)
     if old_dev_file is None:
         old_dev_path = None
         logger.warning(f"[ABI_CHECKER]/{package_name}: No -dev.deb file that does contains '-dev' in the name")
@@ -487,7 +512,7 @@ def single_package_abi_checker(repo_package_dir,
         old_dev_path = os.path.join(old_download_dir, old_dev_file)
         result.old_dev_name = old_dev_file
 
-    old_ddeb_file =  next((f for f in os.listdir(old_download_dir) if f.endswith('.ddeb') and '-dbgsym' in f), None)
+    old_ddeb_file =  next(iter(glob.glob("*-dbgsym*.ddeb", root_dir=old_download_dir)), None)
     if old_ddeb_file is None:
         old_ddeb_path = None
         logger.warning(f"[ABI_CHECKER]/{package_name}: No -dbgsym.ddeb file found that does contains '-dbgsym' in the name")
@@ -499,10 +524,9 @@ def single_package_abi_checker(repo_package_dir,
 
     if print_debug_tree:
         # Run the 'tree' command to list files in a tree structure
-        tree_cmd = f"tree -a {old_extract_dir} | sed 's/^/       /'"
-        tree_output = subprocess.run(tree_cmd, capture_output=True, text=True, shell=True)
+        tree_output = subprocess.run(["tree", "-a", old_extract_dir], capture_output=True, text=True)
         if tree_output.returncode == 0:
-            logger.debug(f"[ABI_CHECKER]: Tree structure of old_extract_dir:\n{tree_output.stdout}")
+            logger.debug(f"[ABI_CHECKER]: Tree structure of old_extract_dir:\n{textwrap.indent(tree_output.stdout, '       ')}")
         else:
             logger.error(f"[ABI_CHECKER]: Failed to run 'tree' command: {tree_output.stderr}")
 
@@ -519,10 +543,8 @@ def single_package_abi_checker(repo_package_dir,
     # The return value between abidiff and abipkgdiff has the same meaning, so we can use the same analysis
     if abidiff_result != 0:
 
-        cmd =f"cat {report_dir}/abipkgdiff_output.txt"
-
-        log = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-        result.abi_pkg_diff_output = log.stdout
+        with open(os.path.join(report_dir, "abipkgdiff_output.txt"), 'r') as log:
+            result.abi_pkg_diff_output = log.read()
 
 
         # Analyze the first 4 bits of the return value
@@ -562,12 +584,12 @@ def single_package_abi_checker(repo_package_dir,
             return_value = RETURN_ABI_INCOMPATIBLE_DIFF
 
         # Print the content of all the files in 'report_dir'
-        for filename in os.listdir(report_dir):
-            file_path = os.path.join(report_dir, filename)
-            if os.path.isfile(file_path):
-                with open(file_path, 'r') as file:
-                    logger.debug(f"Content of {filename}:")
-                    logger.warning(file.read())
+        with os.scandir(report_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    with open(entry.path, 'r') as file:
+                        logger.debug(f"Content of {entry.name}:")
+                        logger.warning(file.read())
 
 
     else:
@@ -632,31 +654,30 @@ def compare_with_abipkgdiff(old_deb_path, old_dev_path, old_ddeb_path,
     os.makedirs(report_dir, exist_ok=True)
     log_path = os.path.join(report_dir, "abipkgdiff_output.txt")
 
-    cmd = "abipkgdiff"
+    cmd = ["abipkgdiff"]
 
     if include_non_reachable_types:
         logger.debug("[ABI_CHECKER]/[ABI_PKG_DIFF] : Using --non-reachable-types option")
-        cmd += " --non-reachable-types"
+        cmd += ["--non-reachable-types"]
 
     if old_dev_path is not None and new_dev_path is not None:
-        cmd += f" --devel-pkg1 {old_dev_path} --devel-pkg2 {new_dev_path}"
+        cmd += ["--devel-pkg1", old_dev_path, "--devel-pkg2", new_dev_path]
     else:
         logger.warning("[ABI_CHECKER]/[ABI_PKG_DIFF]: One or both of the -dev packages are missing. Potentially missing on information")
 
     if old_ddeb_path is not None and new_ddeb_path is not None:
-        cmd += f" --debug-info-pkg1 {old_ddeb_path} --debug-info-pkg2 {new_ddeb_path}"
+        cmd += ["--debug-info-pkg1", old_ddeb_path, "--debug-info-pkg2", new_ddeb_path]
     else:
         logger.warning("[ABI_CHECKER]/[ABI_PKG_DIFF]: One or both of the -dbgsym.ddeb packages are missing. Potentially missing on information")
 
-    cmd += f" {old_deb_path} {new_deb_path}"
-
+    cmd += [old_deb_path, new_deb_path]
 
-    logger.debug(f"[ABI_CHECKER]/[ABI_PKG_DIFF]: command: {cmd}")
 
-    abidiff_output = subprocess.run(cmd, capture_output=True, text=True, shell=True)
+    logger.debug(f"[ABI_CHECKER]/[ABI_PKG_DIFF]: command: {' '.join(cmd)}")
 
+    # Let abipkgdiff write its report straight into the log file, stderr is not used
     with open(log_path, "w") as f:
-        f.write(abidiff_output.stdout)
+        abidiff_output = subprocess.run(cmd, stdout=f, stderr=subprocess.DEVNULL)
 
     rc = abidiff_output.returncode
 
@@ -705,8 +726,6 @@ def extract_upstream_version(version):
 
 
 def analyze_abi_diff_result(old_version, new_version, abidiff_result) -> str:
-    import re
-
     logger.debug(f"old_version: {old_version}")
     logger.debug(f"new_version: {new_version}")
 
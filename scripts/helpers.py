@@ -11,13 +11,7 @@ logging, and setting up a local APT server.
 """
 
 import os
-import stat
-import shlex
-import random
 import shutil
-import subprocess
-import glob
-from pathlib import Path
 
 from color_logger import logger
 
@@ -55,12 +49,11 @@ def create_new_directory(dirname, delete_if_exists=True):
     """
 
     try:
-        if os.path.exists(dirname):
-            # Check if the directory exists, if so delete it
-            if delete_if_exists:
-                cleanup_directory(dirname)
+        # cleanup_directory already checks if the directory exists, no need to stat it twice
+        if delete_if_exists:
+            cleanup_directory(dirname)
         # Create the destination directory
-        os.makedirs(dirname, exist_ok=not delete_if_exists)
+        os.makedirs(dirname, exist_ok=True)
     except Exception as e:
         logger.error(f"Error creating directory {dirname}: {e}")
         exit(1)
@@ -54,7 +54,6 @@ import os
 import sys
 import shutil
 import argparse
-import subprocess
 
 from color_logger import logger
 from helpers import create_new_directory
@@ -102,7 +101,8 @@ def reorganize(build_dir : str, output_dir : str):
     dev_pkg_names = [(f[:-1] if f[-1].isdigit() else f) for f in dev_pkg_names]
     dbg_pkg_names = [(f[:-1] if f[-1].isdigit() else f) for f in dbg_pkg_names]
 
-    package_names = list(set(dsc_pkg_names) | set(deb_pkg_names) | set(dev_pkg_names) | set(dbg_pkg_names))
+    # dict.fromkeys deduplicates in a single pass and, unlike a set, keeps a deterministic order
+    package_names = list(dict.fromkeys(dsc_pkg_names + deb_pkg_names + dev_pkg_names + dbg_pkg_names))
 
     # Important that the list be sorted from the longest package name to the shortest
     # Starting with the longest and removing it from the _files lists ensures we deal